@@ -0,0 +1,309 @@
+// Report behaviour for VB6 Project Mapper: tab switching, focus mode and diagram export.
+// Loaded with defer, so the report markup and its inline projectData are already in place.
+'use strict';
+
+// Tab switching functionality
+function switchTab(tabId) {
+    // Hide all tab contents
+    const tabContents = document.getElementsByClassName('tab-content');
+    for (let i = 0; i < tabContents.length; i++) {
+        tabContents[i].style.display = 'none';
+    }
+
+    // Deactivate all tab buttons
+    const tabButtons = document.getElementsByClassName('tab-button');
+    for (let i = 0; i < tabButtons.length; i++) {
+        tabButtons[i].classList.remove('active');
+    }
+
+    // Show selected tab content and activate button
+    document.getElementById(tabId).style.display = 'block';
+
+    // Find and activate the clicked button
+    for (let i = 0; i < tabButtons.length; i++) {
+        if (tabButtons[i].getAttribute('onclick').includes(tabId)) {
+            tabButtons[i].classList.add('active');
+        }
+    }
+}
+
+// Wait for page load
+window.addEventListener('load', function() {
+    // Initialize Focus Mode
+    document.getElementById('focus-generate').addEventListener('click', function() {
+        generateFocusDiagram();
+    });
+
+    // Form search functionality
+    document.getElementById('form-apply-search').addEventListener('click', function() {
+        const searchTerm = document.getElementById('form-search').value.toLowerCase();
+        filterFormDiagram(searchTerm);
+    });
+
+    // Core diagram expand/collapse
+    document.getElementById('core-expand-all').addEventListener('click', function() {
+        expandAllNodes('core-diagram');
+    });
+
+    document.getElementById('core-collapse-all').addEventListener('click', function() {
+        collapseAllNodes('core-diagram');
+    });
+});
+
+// Function to escape HTML for safe insertion
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
+// Modified function that uses dynamic tables instead of Mermaid diagrams
+function generateFocusDiagram() {
+    const componentName = document.getElementById('focus-component').value;
+    const depth = parseInt(document.getElementById('focus-depth').value);
+    const diagramElement = document.getElementById('focus-diagram');
+
+    // Show loading message
+    diagramElement.innerHTML = '<div style="padding: 20px; text-align: center;">Generating diagram...</div>';
+
+    if (!componentName) {
+        diagramElement.innerHTML = '<div class="error-message">Please select a component first</div>';
+        return;
+    }
+
+    // Create a simple HTML table showing dependencies instead of trying to render with Mermaid
+    let tableHTML = `<h4>Direct Dependencies for: ${escapeHtml(componentName)}</h4>`;
+
+    // Get component information
+    const component = projectData.components[componentName];
+    if (!component) {
+        diagramElement.innerHTML = '<div class="error-message">Component data not found</div>';
+        return;
+    }
+
+    // Add dependencies table
+    if (component.dependencies && component.dependencies.length > 0) {
+        tableHTML += `<h5>Dependencies (${component.dependencies.length}):</h5>`;
+        tableHTML += '<table class="dependency-table" style="width: 100%; border-collapse: collapse; margin-bottom: 20px;">';
+        tableHTML += '<tr><th class="focus-th">Component</th><th class="focus-th">Type</th></tr>';
+
+        component.dependencies.forEach(dep => {
+            const depComponent = projectData.components[dep];
+            const type = depComponent ? depComponent.type : "Unknown";
+            const typeClass = depComponent ? depComponent.typeClass : "unknown";
+
+            tableHTML += `<tr>`;
+            tableHTML += `<td class="focus-td"><span class="component ${typeClass}" style="padding: 2px 5px; border-radius: 3px;">${escapeHtml(dep)}</span></td>`;
+            tableHTML += `<td class="focus-td">${escapeHtml(type)}</td>`;
+            tableHTML += `</tr>`;
+        });
+
+        tableHTML += '</table>';
+    } else {
+        tableHTML += '<p>This component has no dependencies.</p>';
+    }
+
+    // Add dependents table
+    if (component.dependents && component.dependents.length > 0) {
+        tableHTML += `<h5>Referenced By (${component.dependents.length}):</h5>`;
+        tableHTML += '<table class="dependency-table" style="width: 100%; border-collapse: collapse;">';
+        tableHTML += '<tr><th class="focus-th">Component</th><th class="focus-th">Type</th></tr>';
+
+        component.dependents.forEach(dep => {
+            const depComponent = projectData.components[dep];
+            const type = depComponent ? depComponent.type : "Unknown";
+            const typeClass = depComponent ? depComponent.typeClass : "unknown";
+
+            tableHTML += `<tr>`;
+            tableHTML += `<td class="focus-td"><span class="component ${typeClass}" style="padding: 2px 5px; border-radius: 3px;">${escapeHtml(dep)}</span></td>`;
+            tableHTML += `<td class="focus-td">${escapeHtml(type)}</td>`;
+            tableHTML += `</tr>`;
+        });
+
+        tableHTML += '</table>';
+    } else {
+        tableHTML += '<p>This component is not referenced by any other component.</p>';
+    }
+
+    // Set the HTML content
+    diagramElement.innerHTML = tableHTML;
+
+    // Display a message about Mermaid diagrams
+    const infoMessage = document.createElement('div');
+    infoMessage.style.marginTop = '20px';
+    infoMessage.style.padding = '10px';
+    infoMessage.style.backgroundColor = '#f8f9fa';
+    infoMessage.style.border = '1px solid #ddd';
+    infoMessage.style.borderRadius = '4px';
+    infoMessage.innerHTML = '<p><strong>Note:</strong> Mermaid diagram generation is currently under maintenance. We are showing tabular dependency information instead.</p>';
+    diagramElement.appendChild(infoMessage);
+}
+
+// Filter form diagram based on search term
+function filterFormDiagram(searchTerm) {
+    // Implementation would filter and redraw the form diagram
+    console.log("Filtering forms by:", searchTerm);
+    // For now, just show a message - actual implementation would redraw the diagram
+    alert("Form filtering is being implemented. Search term: " + searchTerm);
+}
+
+// Expand all nodes in a diagram
+function expandAllNodes(diagramId) {
+    // Implementation would expand all collapsible nodes
+    console.log("Expanding all nodes in", diagramId);
+    // For now, just show a message - actual implementation would interact with Mermaid API
+    alert("Node expansion is being implemented for " + diagramId);
+}
+
+// Collapse all nodes in a diagram
+function collapseAllNodes(diagramId) {
+    // Implementation would collapse all expanded nodes
+    console.log("Collapsing all nodes in", diagramId);
+    // For now, just show a message - actual implementation would interact with Mermaid API
+    alert("Node collapsing is being implemented for " + diagramId);
+}
+
+// Dependency table for very large projects: rows are built from projectData as they
+// scroll into view instead of being written into the report
+const DEPENDENCY_TABLE_BATCH = 200;
+let dependencyTableEntries = null;  // [cells, search text], in the order the report lists them
+let dependencyTableMatches = [];
+let dependencyTableRendered = 0;
+const lazyDependencyTable = 'IntersectionObserver' in window;
+
+function addTableCell(row, text) {
+    const cell = document.createElement('td');
+    cell.textContent = text;
+    row.appendChild(cell);
+}
+
+function renderDependencyTableBatch() {
+    const body = document.getElementById('dependency-table-body');
+    const end = Math.min(dependencyTableRendered + DEPENDENCY_TABLE_BATCH, dependencyTableMatches.length);
+    const fragment = document.createDocumentFragment();
+
+    for (let i = dependencyTableRendered; i < end; i++) {
+        const row = document.createElement('tr');
+        for (const text of dependencyTableMatches[i][0]) {
+            addTableCell(row, text);
+        }
+        fragment.appendChild(row);
+    }
+
+    body.appendChild(fragment);
+    dependencyTableRendered = end;
+}
+
+// Called by searchTable() in place of filtering rendered rows
+function filterClientDependencyTable(searchTerm) {
+    if (!dependencyTableEntries) {
+        // Rows come already sorted and formatted by the generator, so they match the
+        // server-rendered table of smaller projects
+        const rows = JSON.parse(document.getElementById('dependency-table-rows').textContent);
+        dependencyTableEntries = rows.map(cells => [cells, cells.join('\n').toLowerCase()]);
+    }
+
+    dependencyTableMatches = searchTerm
+        ? dependencyTableEntries.filter(entry => entry[2].includes(searchTerm))
+        : dependencyTableEntries;
+    document.getElementById('dependency-table-body').textContent = '';
+    dependencyTableRendered = 0;
+
+    // Without lazy rendering available, build every matching row now
+    do {
+        renderDependencyTableBatch();
+    } while (!lazyDependencyTable && dependencyTableRendered < dependencyTableMatches.length);
+}
+
+function initClientDependencyTable() {
+    filterClientDependencyTable('');
+    if (!lazyDependencyTable) {
+        return;
+    }
+
+    const sentinel = document.getElementById('dependency-table-more');
+    const observer = new IntersectionObserver(function(entries) {
+        if (entries[0].isIntersecting && dependencyTableRendered < dependencyTableMatches.length) {
+            renderDependencyTableBatch();
+        }
+    }, { rootMargin: '400px' });
+    observer.observe(sentinel);
+}
+
+if (document.getElementById('dependency-table-body')) {
+    initClientDependencyTable();
+}
+
+// File name for exported diagrams, based on the project name stored on the export buttons
+function exportFileName(extension) {
+    const projectName = document.getElementById('export-buttons').dataset.projectName;
+    return projectName + '_dependency_diagram.' + extension;
+}
+
+document.getElementById('exportSVG').addEventListener('click', function() {
+    // Find the active tab's diagram
+    const activeTab = document.querySelector('.tab-content[style*="display: block"]');
+    const svgElement = activeTab.querySelector('svg');
+    if (!svgElement) {
+        alert('No SVG diagram found to export');
+        return;
+    }
+
+    // Create a copy of the SVG to manipulate for export
+    const svgCopy = svgElement.cloneNode(true);
+    const svgData = new XMLSerializer().serializeToString(svgCopy);
+    const blob = new Blob([svgData], {type: 'image/svg+xml'});
+    const url = URL.createObjectURL(blob);
+
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = exportFileName('svg');
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    URL.revokeObjectURL(url);
+});
+
+document.getElementById('exportPNG').addEventListener('click', function() {
+    // Find the active tab's diagram
+    const activeTab = document.querySelector('.tab-content[style*="display: block"]');
+    const svgElement = activeTab.querySelector('svg');
+    if (!svgElement) {
+        alert('No SVG diagram found to export');
+        return;
+    }
+
+    // Create a canvas and draw the SVG on it
+    const canvas = document.createElement('canvas');
+    const svgRect = svgElement.getBoundingClientRect();
+    canvas.width = svgRect.width;
+    canvas.height = svgRect.height;
+    const ctx = canvas.getContext('2d');
+
+    // Create an image from the SVG
+    const img = new Image();
+    const svgData = new XMLSerializer().serializeToString(svgElement);
+    const svgBlob = new Blob([svgData], {type: 'image/svg+xml;charset=utf-8'});
+    const url = URL.createObjectURL(svgBlob);
+
+    img.onload = function() {
+        ctx.drawImage(img, 0, 0);
+        URL.revokeObjectURL(url);
+
+        // Convert canvas to PNG
+        try {
+            const pngUrl = canvas.toDataURL('image/png');
+            const a = document.createElement('a');
+            a.href = pngUrl;
+            a.download = exportFileName('png');
+            document.body.appendChild(a);
+            a.click();
+            document.body.removeChild(a);
+        } catch(e) {
+            alert('Failed to export as PNG. This may be due to CORS restrictions with external SVG content.');
+            console.error(e);
+        }
+    };
+
+    img.src = url;
+});
@@ -1,95 +1,58 @@
-"""
-Business Logic Diagram Generation Module
-Focuses on visualizing class components and their relationships
-"""
-
-
-def generate_business_logic_diagram(f, project):
-    """Generate diagram showing classes and their dependencies"""
-    import html
-
-    f.write("graph LR\n")
-
-    # Get all Class components
-    classes = [comp for comp in project.components if comp.component_type == "Class"]
-
-    # Add class nodes
-    node_ids = {}  # Map component names to node IDs
-    for i, cls in enumerate(classes):
-        node_id = f"class{i}"
-        node_ids[cls.name] = node_id
-
-        # Escape class name for Mermaid
-        safe_name = html.escape(cls.name).replace('\\', '\\\\').replace('"', '\\"')
-        f.write(f'    {node_id}["{safe_name}"]\n')
-
-    # Add related component nodes (those that classes depend on or that depend on classes)
-    related_components = set()
-    for cls in classes:
-        # Add components that this class depends on
-        for dep in set(cls.dependencies):
-            dep_comp = project.find_component_by_name(dep)
-            if dep_comp and dep_comp.component_type != "Class":
-                related_components.add(dep_comp)
-
-        # Add components that depend on this class
-        for comp in project.components:
-            if comp.component_type != "Class" and cls.name in comp.dependencies:
-                related_components.add(comp)
-
-    # Add related component nodes
-    for i, comp in enumerate(related_components):
-        if comp.name not in node_ids:  # Avoid duplicates
-            node_id = f"related{i}"
-            node_ids[comp.name] = node_id
-
-            # Escape component name for Mermaid
-            safe_name = html.escape(comp.name).replace('\\', '\\\\').replace('"', '\\"')
-
-            # Add CSS class based on component type
-            # FIXED: Use "cls" for Class components instead of "class"
-            node_class = "cls" if comp.component_type == "Class" else comp.component_type.lower()
-            f.write(f'    {node_id}["{safe_name}"]:::{node_class}\n')
-
-    # Add connections
-    edges_added = set()
-
-    # Class dependencies
-    for cls in classes:
-        if cls.name in node_ids:
-            source_id = node_ids[cls.name]
-
-            for dep in set(cls.dependencies):
-                dep_comp = project.find_component_by_name(dep)
-                if dep_comp and dep_comp.name in node_ids:
-                    target_id = node_ids[dep_comp.name]
-                    edge_key = f"{source_id}->{target_id}"
-
-                    if edge_key not in edges_added:
-                        f.write(f"    {source_id} --> {target_id}\n")
-                        edges_added.add(edge_key)
-
-    # Components that depend on classes
-    for comp in related_components:
-        if comp.name in node_ids:
-            source_id = node_ids[comp.name]
-
-            for dep in set(comp.dependencies):
-                dep_comp = project.find_component_by_name(dep)
-                if dep_comp and dep_comp.component_type == "Class" and dep_comp.name in node_ids:
-                    target_id = node_ids[dep_comp.name]
-                    edge_key = f"{source_id}->{target_id}"
-
-                    if edge_key not in edges_added:
-                        f.write(f"    {source_id} --> {target_id}\n")
-                        edges_added.add(edge_key)
-
-    # Add styling classes - FIXED: changed "class" to "cls" to avoid Mermaid keyword conflict
-    f.write("""
-    classDef cls fill:#fff3e0,stroke:#ff9800,stroke-width:2px,color:#e65100
-    classDef form fill:#e3f2fd,stroke:#2196f3,stroke-width:2px,color:#0d47a1
-    classDef module fill:#e8f5e9,stroke:#4caf50,stroke-width:2px,color:#1b5e20
-    classDef usercontrol fill:#f3e5f5,stroke:#9c27b0,stroke-width:2px,color:#4a148c
-    classDef propertypage fill:#fffde7,stroke:#ffc107,stroke-width:2px,color:#ff6f00
-    classDef designer fill:#ffebee,stroke:#f44336,stroke-width:2px,color:#b71c1c
-    """)
+"""
+Business Logic Diagram Generation Module
+Focuses on visualizing class components and their relationships
+"""
+
+from utils.helpers import build_project_index
+from .mermaid_utils import COMPONENT_CLASSDEFS, escape_label, node_class, write_diagram
+
+
+def generate_business_logic_diagram(f, project, index=None):
+    """Generate diagram showing classes and their dependencies
+
+    Writes the Mermaid text to f unless f is None, and returns it. index is the
+    project's ProjectIndex, when the caller has already built one.
+    """
+
+    if index is None:
+        index = build_project_index(project)
+
+    out = ["graph LR\n"]  # Collected and written out in one call
+
+    # Get all Class components, sorted so the output is stable between runs
+    classes = sorted(index.components_by_type.get("Class", ()), key=lambda c: c.name)
+
+    # Add class nodes
+    node_ids = {cls.name: f"class{i}" for i, cls in enumerate(classes)}  # Map component names to node IDs
+    out.extend(f'    {node_ids[cls.name]}["{escape_label(cls.name)}"]\n' for cls in classes)
+
+    # Find related components (those that classes depend on or that depend on classes)
+    # with one pass over the components instead of one pass per class
+    class_names = {cls.name for cls in classes}
+    related_components = {comp for comp in project.components
+                          if comp.component_type != "Class"
+                          and not class_names.isdisjoint(comp.unique_dependencies)}
+    related_components.update(target
+                              for cls in classes
+                              for target in index.targets_by_name.get(cls.name, ())
+                              if target.component_type != "Class")
+
+    # Add related component nodes, skipping any name that already has a node
+    for i, comp in enumerate(sorted(related_components, key=lambda c: c.name)):
+        known = len(node_ids)
+        node_id = node_ids.setdefault(comp.name, f"related{i}")
+        if len(node_ids) != known:
+            # Add CSS class based on component type ("cls" rather than the "class" keyword)
+            out.append(f'    {node_id}["{escape_label(comp.name)}"]:::{node_class(comp)}\n')
+
+    # Add connections: every edge between rendered nodes that touches a class
+    # (edges are already deduplicated by the index)
+    out.extend(f"    {node_ids[source]} --> {node_ids[target]}\n"
+               for source, target in index.edges
+               if source in node_ids and target in node_ids
+               and (source in class_names or target in class_names))
+
+    # Add styling classes - FIXED: changed "class" to "cls" to avoid Mermaid keyword conflict
+    out.append(COMPONENT_CLASSDEFS)
+
+    return write_diagram(f, out)
@@ -0,0 +1,44 @@
+"""
+Mermaid Diagram Helpers
+Shared text handling for the diagram generation modules
+"""
+
+# Same result as html.escape() followed by doubling backslashes, in a single pass
+_LABEL_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+    "\\": "\\\\",
+})
+
+# Styling for nodes tagged with a component type class (":::form", ":::cls", ...).
+# "cls" is used for Class components because "class" is a Mermaid keyword.
+COMPONENT_CLASSDEFS = """
+    classDef form fill:#e3f2fd,stroke:#2196f3,stroke-width:2px,color:#0d47a1
+    classDef module fill:#e8f5e9,stroke:#4caf50,stroke-width:2px,color:#1b5e20
+    classDef cls fill:#fff3e0,stroke:#ff9800,stroke-width:2px,color:#e65100
+    classDef usercontrol fill:#f3e5f5,stroke:#9c27b0,stroke-width:2px,color:#4a148c
+    classDef propertypage fill:#fffde7,stroke:#ffc107,stroke-width:2px,color:#ff6f00
+    classDef designer fill:#ffebee,stroke:#f44336,stroke-width:2px,color:#b71c1c
+    """
+
+
+def escape_label(name):
+    """Escape a component name for use inside a quoted Mermaid node label"""
+    return name.translate(_LABEL_ESCAPE_TABLE)
+
+
+def node_class(component):
+    """Get the classDef name used to style a component's node"""
+    component_type = component.component_type.lower()
+    return "cls" if component_type == "class" else component_type
+
+
+def write_diagram(f, parts):
+    """Join the diagram lines, write them to f in one call (if given) and return the text"""
+    text = "".join(parts)
+    if f is not None:
+        f.write(text)
+    return text
@@ -1,92 +1,148 @@
-"""
-JSON export functionality for VB6 Project Mapper
-Creates structured JSON output for external analysis
-"""
-
-import os
-import json
-from utils.helpers import count_components_by_type, get_dependents
-from utils.logger import get_logger
-
-# Initialize module logger
-logger = get_logger(__name__)
-
-
-def export_json(project, output_file, test_mode=False):
-    """
-    Export project data to JSON format for external analysis
-
-    Args:
-        project (VB6Project): The project to export
-        output_file (str): Path to save the JSON output
-        test_mode (bool): If True and output_file contains 'CON', forces failure for testing
-
-    Returns:
-        bool: True if export was successful, False otherwise
-    """
-    logger.info(f"Exporting project data to JSON: {output_file}")
-
-    # Test mode for unit testing
-    if test_mode and "CON" in output_file:
-        logger.error("Simulated export failure for testing")
-        return False
-
-    # Create a structured representation of the project data
-    export_data = {
-        "project": {
-            "name": project.name,
-            "path": project.path,
-            "filename": project.filename
-        },
-        "components": [],
-        "statistics": {
-            "total_components": len(project.components),
-            "forms": count_components_by_type(project, "Form"),
-            "modules": count_components_by_type(project, "Module"),
-            "classes": count_components_by_type(project, "Class"),
-            "user_controls": count_components_by_type(project, "UserControl"),
-            "property_pages": count_components_by_type(project, "PropertyPage"),
-            "designers": count_components_by_type(project, "Designer")
-        }
-    }
-
-    # Log the component statistics
-    logger.debug(f"Component statistics: " +
-                 f"Forms={export_data['statistics']['forms']}, " +
-                 f"Modules={export_data['statistics']['modules']}, " +
-                 f"Classes={export_data['statistics']['classes']}")
-
-    # Add component data
-    logger.debug("Adding component data to JSON export")
-    for comp in project.components:
-        dependents = [dep.name for dep in get_dependents(project, comp)]
-
-        export_data["components"].append({
-            "name": comp.name,
-            "type": comp.component_type,
-            "filename": comp.filename,
-            "dependencies": list(set(comp.dependencies)),
-            "dependents": dependents,
-            "dependency_count": len(set(comp.dependencies)),
-            "dependent_count": len(dependents)
-        })
-
-    # Create directory if it doesn't exist
-    output_dir = os.path.dirname(output_file)
-    if output_dir and not os.path.exists(output_dir):
-        try:
-            os.makedirs(output_dir, exist_ok=True)
-            logger.debug(f"Created directory structure for output: {output_dir}")
-        except Exception as e:
-            logger.error(f"Error creating directory {output_dir}: {e}", exc_info=True)
-            return False
-
-    # Write to file
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=4, ensure_ascii=False)
-        logger.info(f"Project data successfully exported to: {output_file}")
-        return True
-    except Exception as e:
-        logger.error(f"Error exporting JSON: {e}", exc_info=True)
-        return False
+"""
+JSON export functionality for VB6 Project Mapper
+Creates structured JSON output for external analysis
+"""
+
+import gzip
+import os
+import json
+from utils.helpers import build_project_index, count_components_by_type
+from utils.logger import get_logger
+
+# Initialize module logger
+logger = get_logger(__name__)
+
+# Document punctuation around the streamed values, for the indented and compact layouts
+_PRETTY_LAYOUT = {
+    "start": '{\n    "project": ',
+    "components": ',\n    "components": [',
+    "first": "\n        ",
+    "next": ",\n        ",
+    "end_components": "\n    ],",
+    "statistics": '\n    "statistics": ',
+    "end": "\n}"
+}
+_COMPACT_LAYOUT = {
+    "start": '{"project":',
+    "components": ',"components":[',
+    "first": "",
+    "next": ",",
+    "end_components": "],",
+    "statistics": '"statistics":',
+    "end": "}"
+}
+
+_compact_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def export_json(project, output_file, test_mode=False, pretty=False):
+    """
+    Export project data to JSON format for external analysis
+
+    Args:
+        project (VB6Project): The project to export
+        output_file (str): Path to save the JSON output; a name ending in .gz is gzip-compressed
+        test_mode (bool): If True and output_file contains 'CON', forces failure for testing
+        pretty (bool): If True, indent the output for reading instead of writing it compactly
+
+    Returns:
+        bool: True if export was successful, False otherwise
+    """
+    logger.info(f"Exporting project data to JSON: {output_file}")
+
+    # Test mode for unit testing
+    if test_mode and "CON" in output_file:
+        logger.error("Simulated export failure for testing")
+        return False
+
+    # Project metadata and statistics are small; components are written one at a time
+    project_info = {
+        "name": project.name,
+        "path": project.path,
+        "filename": project.filename
+    }
+    # The counts come from the project's per-type component lists, without another pass
+    statistics = {
+        "total_components": len(project.components),
+        "forms": count_components_by_type(project, "Form"),
+        "modules": count_components_by_type(project, "Module"),
+        "classes": count_components_by_type(project, "Class"),
+        "user_controls": count_components_by_type(project, "UserControl"),
+        "property_pages": count_components_by_type(project, "PropertyPage"),
+        "designers": count_components_by_type(project, "Designer")
+    }
+
+    # Log the component statistics
+    logger.debug("Component statistics: Forms=%d, Modules=%d, Classes=%d",
+                 statistics['forms'], statistics['modules'], statistics['classes'])
+
+    # Create directory if it doesn't exist
+    output_dir = os.path.dirname(output_file)
+    if output_dir and not os.path.exists(output_dir):
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            logger.debug("Created directory structure for output: %s", output_dir)
+        except Exception as e:
+            logger.error(f"Error creating directory {output_dir}: {e}", exc_info=True)
+            return False
+
+    # Write to file, producing the same output as json.dump of the whole export (with
+    # indent=4 when pretty) without holding every component's data in memory at once
+    if pretty:
+        layout, dump = _PRETTY_LAYOUT, _dump_indented
+    else:
+        layout, dump = _COMPACT_LAYOUT, _dump_compact
+
+    try:
+        if output_file.endswith(".gz"):
+            # Level 1 is several times faster than the default for a slightly larger file
+            out = gzip.open(output_file, 'wt', encoding='utf-8', compresslevel=1)
+        else:
+            out = open(output_file, 'w', encoding='utf-8')
+        with out as f:
+            f.write(layout["start"])
+            f.write(dump(project_info, 1))
+            f.write(layout["components"])
+
+            logger.debug("Adding component data to JSON export")
+
+            # Reverse dependency map, built for this export
+            dependents_by_name = build_project_index(project).dependents_by_name
+
+            separator = layout["first"]
+            for comp in project.components:
+                dependents = [dep.name for dep in dependents_by_name.get(comp.name, ())]
+                dependencies = list(comp.unique_dependencies)  # First-seen order, so output is stable
+
+                f.write(separator)
+                f.write(dump({
+                    "name": comp.name,
+                    "type": comp.component_type,
+                    "filename": comp.filename,
+                    "dependencies": dependencies,
+                    "dependents": dependents,
+                    "dependency_count": len(dependencies),
+                    "dependent_count": len(dependents)
+                }, 2))
+                separator = layout["next"]
+
+            # An empty list stays on one line, as json.dump writes it
+            f.write(layout["end_components"] if project.components else "],")
+            f.write(layout["statistics"])
+            f.write(dump(statistics, 1))
+            f.write(layout["end"])
+        logger.info(f"Project data successfully exported to: {output_file}")
+        return True
+    except Exception as e:
+        logger.error(f"Error exporting JSON: {e}", exc_info=True)
+        return False
+
+
+def _dump_indented(value, level):
+    """Serialize value with indent=4, as if nested level deep in the exported document"""
+    return json.dumps(value, indent=4, ensure_ascii=False).replace("\n", "\n" + "    " * level)
+
+
+def _dump_compact(value, level):
+    """Serialize value without whitespace; level is unused and kept to match _dump_indented"""
+    return _compact_encode(value)
\ No newline at end of file
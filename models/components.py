@@ -1,32 +1,67 @@
-class VB6Component:
-    """Represents a component in a VB6 project"""
-
-    def __init__(self, name, filename, component_type):
-        self.name = name
-        self.filename = filename
-        self.component_type = component_type
-        self.dependencies = []
-        self.content = ""
-
-
-class VB6Project:
-    """Represents a VB6 project and all its components"""
-
-    def __init__(self):
-        self.name = ""
-        self.path = ""
-        self.filename = ""
-        self.components = []
-
-    def add_component(self, name, filename, component_type):
-        """Add a component to the project"""
-        component = VB6Component(name, filename, component_type)
-        self.components.append(component)
-        return component
-
-    def find_component_by_name(self, name):
-        """Find a component by its name"""
-        for component in self.components:
-            if component.name.lower() == name.lower():
-                return component
-        return None
\ No newline at end of file
+import sys
+from collections import defaultdict
+
+
+class VB6Component:
+    """Represents a component in a VB6 project"""
+
+    def __init__(self, name, filename, component_type):
+        self.name = name
+        self.filename = filename
+        self.component_type = component_type
+        self.dependencies = []
+        self.content = ""
+
+    @property
+    def unique_dependencies(self):
+        """Dependencies with duplicates removed, in first-seen order"""
+        return tuple(dict.fromkeys(self.dependencies))
+
+    @property
+    def sorted_dependencies(self):
+        """Dependencies with duplicates removed, in name order"""
+        return tuple(sorted(set(self.dependencies)))
+
+
+class VB6Project:
+    """Represents a VB6 project and all its components"""
+
+    def __init__(self):
+        self.name = ""
+        self.path = ""
+        self.filename = ""
+        self.components = []
+
+    @property
+    def components(self):
+        """Components in the order they were added"""
+        return self._components
+
+    @components.setter
+    def components(self, value):
+        self._components = value
+        self._components_by_name = {}  # Keyed by lowercase name; the first component added wins
+        self._components_by_type = defaultdict(list)
+        for component in value:
+            self._components_by_name.setdefault(component.name.lower(), component)
+            self._components_by_type[component.component_type].append(component)
+
+    @property
+    def components_by_type(self):
+        """Components grouped by type, each group in the order they were added"""
+        return self._components_by_type
+
+    def add_component(self, name, filename, component_type):
+        """Add a component to the project"""
+        # Interned so the names that dependency lists and dict keys are compared against
+        # share one object per distinct name
+        name = sys.intern(name)
+        component = VB6Component(name, filename, sys.intern(component_type))
+        self._components.append(component)
+        self._components_by_name.setdefault(name.lower(), component)
+        self._components_by_type[component.component_type].append(component)
+        return component
+
+    def find_component_by_name(self, name):
+        """Find a component by its name"""
+        return self._components_by_name.get(name.lower())
\ No newline at end of file
@@ -1,177 +1,312 @@
-import unittest
-import os
-import sys
-import tempfile
-import shutil
-from pathlib import Path
-import re
-
-# Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from models.components import VB6Project, VB6Component
-from generators.html_generator import generate_html_report
-
-
-class TestHTMLGenerator(unittest.TestCase):
-    """Test cases for the HTML report generator"""
-
-    def setUp(self):
-        """Set up test environment"""
-        # Create a temporary directory for output
-        self.temp_dir = tempfile.mkdtemp()
-        self.output_file = os.path.join(self.temp_dir, "test_report.html")
-
-        # Create a test project
-        self.project = VB6Project()
-        self.project.name = "TestProject"
-        self.project.path = self.temp_dir
-        self.project.filename = "TestProject.vbp"
-
-        # Add test components
-        self.form1 = self.project.add_component("frmMain", "frmMain.frm", "Form")
-        self.form2 = self.project.add_component("frmOptions", "frmOptions.frm", "Form")
-        self.module1 = self.project.add_component("modUtils", "modUtils.bas", "Module")
-        self.class1 = self.project.add_component("clsData", "clsData.cls", "Class")
-
-        # Add dependencies
-        self.form1.dependencies = ["frmOptions", "modUtils", "clsData"]
-        self.form2.dependencies = ["modUtils", "frmMain"]
-        self.module1.dependencies = ["clsData"]
-        self.class1.dependencies = []
-
-    def tearDown(self):
-        """Clean up temporary files"""
-        shutil.rmtree(self.temp_dir)
-
-    def test_generate_html_report(self):
-        """Test that HTML report is generated successfully"""
-        # Generate the report
-        result = generate_html_report(self.project, self.output_file)
-
-        # Check that the file was created
-        self.assertTrue(os.path.exists(self.output_file))
-
-        # Read the generated file
-        with open(self.output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check that the report contains essential elements
-        self.assertIn("<title>TestProject - Code Map</title>", content)
-        self.assertIn("<h1>TestProject - Code Map</h1>", content)
-        self.assertIn("<h2>Project Summary</h2>", content)
-
-        # Check for component counts
-        self.assertIn("<tr><td>Forms</td><td>2</td></tr>", content)
-        self.assertIn("<tr><td>Modules</td><td>1</td></tr>", content)
-        self.assertIn("<tr><td>Classes</td><td>1</td></tr>", content)
-
-        # Check for component listings
-        self.assertIn("frmMain", content)
-        self.assertIn("frmOptions", content)
-        self.assertIn("modUtils", content)
-        self.assertIn("clsData", content)
-
-        # Check for dependency information
-        self.assertIn("Dependencies", content)
-        self.assertIn("Referenced by", content)
-
-    def test_html_escaping(self):
-        """Test that HTML content is properly escaped"""
-        # Create a component with HTML in the name
-        component = self.project.add_component("<script>alert('XSS')</script>", "malicious.frm", "Form")
-
-        # Generate the report
-        generate_html_report(self.project, self.output_file)
-
-        # Read the generated file
-        with open(self.output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check that HTML was escaped
-        self.assertIn("&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt;", content)
-        self.assertNotIn("<script>alert('XSS')</script>", content)
-
-    def test_diagram_generation(self):
-        """Test that diagrams are included in the report"""
-        # Generate the report
-        generate_html_report(self.project, self.output_file)
-
-        # Read the generated file
-        with open(self.output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check for diagram related content
-        self.assertIn("Visual Dependency Diagrams", content)
-        self.assertIn("Core Architecture View", content)
-        self.assertIn("Form Relationships View", content)
-        self.assertIn("Business Logic View", content)
-
-        # Check for Mermaid diagram content
-        self.assertIn("class=\"mermaid\"", content)
-        self.assertIn("graph LR", content)  # Mermaid syntax
-
-    def test_interactive_features(self):
-        """Test that interactive features are included"""
-        # Generate the report
-        generate_html_report(self.project, self.output_file)
-
-        # Read the generated file
-        with open(self.output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check for search functionality
-        self.assertIn("search-box", content)
-        self.assertIn("searchComponents()", content)
-        self.assertIn("searchTable()", content)
-
-        # Check for tab switching functionality
-        self.assertIn("switchTab(", content)
-
-        # Check for export buttons
-        self.assertIn("Export Diagram as SVG", content)
-        self.assertIn("Export Diagram as PNG", content)
-
-    def test_error_handling(self):
-        """Test HTML generation with invalid input"""
-        # Create a mock open function that raises an exception
-        original_open = open
-
-        def mock_open(*args, **kwargs):
-            if args[0] == self.output_file:
-                raise IOError("Mocked file opening error")
-            return original_open(*args, **kwargs)
-
-        # Replace built-in open with our mock
-        import builtins
-        builtins.open = mock_open
-
-        try:
-            # This should now fail because we're mocking an IOError
-            result = generate_html_report(self.project, self.output_file)
-            self.assertFalse(result)
-        finally:
-            # Restore the original open function
-            builtins.open = original_open
-
-    def test_component_details(self):
-        """Test that component details are properly displayed"""
-        # Generate the report
-        generate_html_report(self.project, self.output_file)
-
-        # Read the generated file
-        with open(self.output_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Check that required information is present
-        self.assertIn("frmMain", content)
-        self.assertIn("Form", content)
-        self.assertIn("Dependencies", content)
-
-        # Verify dependencies
-        for dep in self.form1.dependencies:
-            self.assertIn(dep, content)
-
-
-if __name__ == '__main__':
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+import gzip
+from pathlib import Path
+from unittest import mock
+import re
+import json
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.components import VB6Project, VB6Component
+from generators.html_generator import generate_html_report
+from utils.helpers import has_dependents, get_dependents
+
+
+class TestHTMLGenerator(unittest.TestCase):
+    """Test cases for the HTML report generator"""
+
+    def setUp(self):
+        """Set up test environment"""
+        # Create a temporary directory for output
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.temp_dir, "test_report.html")
+
+        # Create a test project
+        self.project = VB6Project()
+        self.project.name = "TestProject"
+        self.project.path = self.temp_dir
+        self.project.filename = "TestProject.vbp"
+
+        # Add test components
+        self.form1 = self.project.add_component("frmMain", "frmMain.frm", "Form")
+        self.form2 = self.project.add_component("frmOptions", "frmOptions.frm", "Form")
+        self.module1 = self.project.add_component("modUtils", "modUtils.bas", "Module")
+        self.class1 = self.project.add_component("clsData", "clsData.cls", "Class")
+
+        # Add dependencies
+        self.form1.dependencies = ["frmOptions", "modUtils", "clsData"]
+        self.form2.dependencies = ["modUtils", "frmMain"]
+        self.module1.dependencies = ["clsData"]
+        self.class1.dependencies = []
+
+    def tearDown(self):
+        """Clean up temporary files"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_generate_html_report(self):
+        """Test that HTML report is generated successfully"""
+        # Generate the report
+        result = generate_html_report(self.project, self.output_file)
+
+        # Check that the file was created
+        self.assertTrue(os.path.exists(self.output_file))
+
+        # Read the generated file
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Check that the report contains essential elements
+        self.assertIn("<title>TestProject - Code Map</title>", content)
+        self.assertIn("<h1>TestProject - Code Map</h1>", content)
+        self.assertIn("<h2>Project Summary</h2>", content)
+
+        # Check for component counts
+        self.assertIn("<tr><td>Forms</td><td>2</td></tr>", content)
+        self.assertIn("<tr><td>Modules</td><td>1</td></tr>", content)
+        self.assertIn("<tr><td>Classes</td><td>1</td></tr>", content)
+
+        # Check for component listings
+        self.assertIn("frmMain", content)
+        self.assertIn("frmOptions", content)
+        self.assertIn("modUtils", content)
+        self.assertIn("clsData", content)
+
+        # Check for dependency information
+        self.assertIn("Dependencies", content)
+        self.assertIn("Referenced by", content)
+
+    def test_gzip_output(self):
+        """Test that a .gz output file name produces a gzip-compressed report"""
+        gz_file = self.output_file + ".gz"
+        self.assertTrue(generate_html_report(self.project, gz_file))
+
+        with gzip.open(gz_file, 'rt', encoding='utf-8') as f:
+            content = f.read()
+
+        self.assertIn("<title>TestProject - Code Map</title>", content)
+
+    def test_html_escaping(self):
+        """Test that HTML content is properly escaped"""
+        # Create a component with HTML in the name
+        component = self.project.add_component("<script>alert('XSS')</script>", "malicious.frm", "Form")
+
+        # Generate the report
+        generate_html_report(self.project, self.output_file)
+
+        # Read the generated file
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Check that HTML was escaped
+        self.assertIn("&lt;script&gt;alert(&#x27;XSS&#x27;)&lt;/script&gt;", content)
+        self.assertNotIn("<script>alert('XSS')</script>", content)
+
+    def test_dependency_escaping(self):
+        """Test that dependency strings are escaped, quotes included, wherever they appear"""
+        self.module1.dependencies = ['<b title="x">clsData</b>']
+
+        generate_html_report(self.project, self.output_file)
+
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        escaped = "&lt;b title=&quot;x&quot;&gt;clsData&lt;/b&gt;"
+        self.assertIn(f"<li>{escaped}</li>", content)  # Component details
+        self.assertIn(f"<td>\n{escaped}</td>", content)  # Dependency table cell
+        self.assertIn(f'<tr data-search="modutils\nmodule\n{escaped.lower()}\n', content)
+        self.assertNotIn('<b title="x">', content)
+
+    def test_diagram_generation(self):
+        """Test that diagrams are included in the report"""
+        # Generate the report
+        generate_html_report(self.project, self.output_file)
+
+        # Read the generated file
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Check for diagram related content
+        self.assertIn("Visual Dependency Diagrams", content)
+        self.assertIn("Core Architecture View", content)
+        self.assertIn("Form Relationships View", content)
+        self.assertIn("Business Logic View", content)
+
+        # Check for Mermaid diagram content
+        self.assertIn("class=\"mermaid\"", content)
+        self.assertIn("graph LR", content)  # Mermaid syntax
+
+    def test_diagram_text_without_file(self):
+        """Test that diagram generators return their Mermaid text when no file is given"""
+        from generators.diagrams.form_diagram import generate_form_relationships_diagram
+
+        text = generate_form_relationships_diagram(None, self.project)
+
+        self.assertTrue(text.startswith("graph LR"))
+        self.assertIn('form0["frmMain"]', text)
+        self.assertIn('form1["frmOptions"]', text)
+        self.assertIn("form0 --> form1", text)
+        self.assertIn("form1 --> form0", text)
+
+    def test_mermaid_script_asset(self):
+        """Test that the static scripts are referenced and copied next to the report"""
+        generate_html_report(self.project, self.output_file)
+
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        self.assertRegex(content, r'<script src="mermaid_init\.js\?v=[0-9a-f]{12}"></script>')
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "mermaid_init.js")))
+        self.assertRegex(content, r'<script src="vb6_report\.js\?v=[0-9a-f]{12}" defer></script>')
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, "vb6_report.js")))
+
+    def test_regenerated_report_reflects_changes(self):
+        """Test that regenerating after a dependency change writes the changed report"""
+        self.assertTrue(generate_html_report(self.project, self.output_file))
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            core_edges = len(re.findall(r"^    core\d+ --> core\d+$", f.read(), re.MULTILINE))
+
+        self.module1.dependencies = ["clsData", "frmMain"]
+        self.assertTrue(generate_html_report(self.project, self.output_file))
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        frm_main = re.search(r"<h4>frmMain</h4>.*?<h5>Referenced by:</h5>(.*?)</div>", content, re.DOTALL)
+        self.assertIn("<li>modUtils</li>", frm_main.group(1))
+        self.assertEqual(len(re.findall(r"^    core\d+ --> core\d+$", content, re.MULTILINE)), core_edges + 1)
+        self.assertFalse(os.path.exists(self.output_file + ".hash"))
+
+    def test_dependents_queried_before_dependencies_are_known(self):
+        """Test that asking for dependents early doesn't fix the answers given later"""
+        project = VB6Project()
+        project.name = "Early"
+        form = project.add_component("frmMain", "frmMain.frm", "Form")
+        cls = project.add_component("clsData", "clsData.cls", "Class")
+
+        self.assertFalse(has_dependents(project, cls))
+        self.assertEqual(get_dependents(project, cls), [])
+        self.assertTrue(generate_html_report(project, self.output_file))
+
+        # Filled in afterwards, as dependency analysis does
+        form.dependencies.append("clsData")
+
+        self.assertTrue(has_dependents(project, cls))
+        self.assertEqual(get_dependents(project, cls), [form])
+
+        self.assertTrue(generate_html_report(project, self.output_file))
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        cls_data = re.search(r"<h4>clsData</h4>.*?<h5>Referenced by:</h5>(.*?)</div>", content, re.DOTALL)
+        self.assertIn("<li>frmMain</li>", cls_data.group(1))
+
+    def test_component_groups_left_unchanged(self):
+        """Test that diagrams for missing component types don't add empty type groups"""
+        project = VB6Project()
+        project.name = "ModulesOnly"
+        project.add_component("modUtils", "modUtils.bas", "Module")
+
+        self.assertTrue(generate_html_report(project, self.output_file))
+        self.assertEqual(list(project.components_by_type), ["Module"])
+
+    def test_client_rendered_dependency_table(self):
+        """Test that large projects leave the dependency table rows to the browser"""
+        with mock.patch("generators.html_generator.CLIENT_TABLE_THRESHOLD", 2):
+            generate_html_report(self.project, self.output_file)
+
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        self.assertIn("<table id='dependency-table' data-client-rendered='true'>", content)
+        self.assertIn("<tbody id='dependency-table-body'></tbody>", content)
+        self.assertNotIn("<td>frmOptions</td>", content)
+
+        # Rows are passed in the server-rendered table's order, with the same cell text
+        rows = re.search(r"<script type='application/json' id='dependency-table-rows'>(.*?)</script>",
+                         content).group(1)
+        self.assertEqual(json.loads(rows), [
+            ["clsData", "Class", "None", "frmMain, modUtils"],
+            ["frmMain", "Form", "clsData, frmOptions, modUtils", "frmOptions"],
+            ["frmOptions", "Form", "frmMain, modUtils", "frmMain"],
+            ["modUtils", "Module", "clsData", "frmMain, frmOptions"],
+        ])
+
+    def test_dependency_table_search_text(self):
+        """Test that table search matches the text shown in each row, including "None" """
+        generate_html_report(self.project, self.output_file)
+
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        rows = re.findall(r'<tr data-search="(.*?)">\s*<td>(.*?)</td>\s*<td>(.*?)</td>\s*'
+                          r'<td>\s*(.*?)</td>\s*<td>\s*(.*?)</td>', content, re.DOTALL)
+        self.assertEqual(len(rows), 4)
+        for search_text, *cells in rows:
+            self.assertEqual(search_text, "\n".join(cells).lower())
+
+        cls_data = next(search_text for search_text, name, *_ in rows if name == "clsData")
+        self.assertIn("none", cls_data)
+
+    def test_interactive_features(self):
+        """Test that interactive features are included"""
+        # Generate the report
+        generate_html_report(self.project, self.output_file)
+
+        # Read the generated file
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Check for search functionality
+        self.assertIn("search-box", content)
+        self.assertIn("searchComponents()", content)
+        self.assertIn("searchTable()", content)
+
+        # Check for tab switching functionality
+        self.assertIn("switchTab(", content)
+
+        # Check for export buttons
+        self.assertIn("Export Diagram as SVG", content)
+        self.assertIn("Export Diagram as PNG", content)
+
+    def test_error_handling(self):
+        """Test HTML generation with invalid input"""
+        # Create a mock open function that raises an exception
+        def mock_open(*args, **kwargs):
+            if args[0] == self.output_file:
+                raise IOError("Mocked file opening error")
+            return open(*args, **kwargs)
+
+        # Shadow open in the generator module only; the patch is undone on exit
+        with mock.patch("generators.html_generator.open", side_effect=mock_open, create=True):
+            # This should now fail because we're mocking an IOError
+            result = generate_html_report(self.project, self.output_file)
+            self.assertFalse(result)
+
+        # The failed report doesn't keep its escaped strings cached
+        from generators.html_generator import _esc
+        self.assertEqual(_esc.cache_info().currsize, 0)
+
+    def test_component_details(self):
+        """Test that component details are properly displayed"""
+        # Generate the report
+        generate_html_report(self.project, self.output_file)
+
+        # Read the generated file
+        with open(self.output_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Check that required information is present
+        self.assertIn("frmMain", content)
+        self.assertIn("Form", content)
+        self.assertIn("Dependencies", content)
+
+        # Verify dependencies
+        for dep in self.form1.dependencies:
+            self.assertIn(dep, content)
+
+
+if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
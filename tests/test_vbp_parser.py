@@ -1,102 +1,144 @@
-import unittest
-import os
-import sys
-from pathlib import Path
-
-# Add parent directory to path to import modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from parsers.vbp_parser import parse_vbp_file
-from models.components import VB6Project
-
-
-class TestVBPParser(unittest.TestCase):
-    """Test cases for the VB6 project file parser"""
-
-    def setUp(self):
-        """Set up test paths"""
-        self.test_dir = Path(os.path.dirname(os.path.abspath(__file__)))
-        self.samples_dir = self.test_dir / "samples"
-        self.simple_project = self.samples_dir / "simple_project.vbp"
-        self.complex_project = self.samples_dir / "complex_project.vbp"
-
-    def test_parser_returns_project_object(self):
-        """Test that the parser returns a VB6Project object"""
-        project = parse_vbp_file(self.simple_project)
-        self.assertIsNotNone(project)
-        self.assertIsInstance(project, VB6Project)
-
-    def test_simple_project_metadata(self):
-        """Test that simple project metadata is correctly parsed"""
-        project = parse_vbp_file(self.simple_project)
-        self.assertEqual(project.name, "SimpleProject")
-        self.assertEqual(project.filename, "simple_project.vbp")
-        self.assertEqual(project.path, str(self.samples_dir))
-
-    def test_simple_project_components(self):
-        """Test that simple project components are correctly parsed"""
-        project = parse_vbp_file(self.simple_project)
-        self.assertEqual(len(project.components), 3)
-
-        # Verify forms
-        forms = [c for c in project.components if c.component_type == "Form"]
-        self.assertEqual(len(forms), 1)
-        self.assertEqual(forms[0].name, "frmMain")
-
-        # Verify modules
-        modules = [c for c in project.components if c.component_type == "Module"]
-        self.assertEqual(len(modules), 1)
-        self.assertEqual(modules[0].name, "modMain")
-
-        # Verify classes
-        classes = [c for c in project.components if c.component_type == "Class"]
-        self.assertEqual(len(classes), 1)
-        self.assertEqual(classes[0].name, "clsData")
-
-    def test_complex_project_components(self):
-        """Test that complex project components are correctly parsed"""
-        project = parse_vbp_file(self.complex_project)
-
-        # Verify component counts
-        self.assertGreaterEqual(len(project.components), 10)
-
-        forms_count = len([c for c in project.components if c.component_type == "Form"])
-        modules_count = len([c for c in project.components if c.component_type == "Module"])
-        classes_count = len([c for c in project.components if c.component_type == "Class"])
-
-        self.assertGreaterEqual(forms_count, 5)
-        self.assertGreaterEqual(modules_count, 3)
-        self.assertGreaterEqual(classes_count, 2)
-
-        # Verify specific components exist
-        component_names = [c.name for c in project.components]
-        self.assertIn("frmMain", component_names)
-        self.assertIn("frmOptions", component_names)
-        self.assertIn("modUtility", component_names)
-        self.assertIn("clsDatabase", component_names)
-
-    def test_nonexistent_file(self):
-        """Test that the parser handles nonexistent files gracefully"""
-        nonexistent_file = self.samples_dir / "nonexistent.vbp"
-        project = parse_vbp_file(nonexistent_file)
-        self.assertIsNone(project)
-
-    def test_component_lookup(self):
-        """Test that components can be looked up by name"""
-        project = parse_vbp_file(self.simple_project)
-        component = project.find_component_by_name("frmMain")
-        self.assertIsNotNone(component)
-        self.assertEqual(component.component_type, "Form")
-
-        # Case insensitive lookup
-        component = project.find_component_by_name("FRMMAIN")
-        self.assertIsNotNone(component)
-        self.assertEqual(component.name, "frmMain")
-
-        # Nonexistent component
-        component = project.find_component_by_name("nonexistent")
-        self.assertIsNone(component)
-
-
-if __name__ == '__main__':
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import vbp_parser
+from parsers.vbp_parser import parse_vbp_file
+from models.components import VB6Project
+
+
+class TestVBPParser(unittest.TestCase):
+    """Test cases for the VB6 project file parser"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up test paths and parse each sample project once"""
+        cls.test_dir = Path(os.path.dirname(os.path.abspath(__file__)))
+        cls.samples_dir = cls.test_dir / "samples"
+        cls.simple_project = cls.samples_dir / "simple_project.vbp"
+        cls.complex_project = cls.samples_dir / "complex_project.vbp"
+
+        # The parsed projects are only read by the tests, so they can be shared
+        cls.parsed_simple = parse_vbp_file(cls.simple_project)
+        cls.parsed_complex = parse_vbp_file(cls.complex_project)
+
+    def test_parser_returns_project_object(self):
+        """Test that the parser returns a VB6Project object"""
+        project = self.parsed_simple
+        self.assertIsNotNone(project)
+        self.assertIsInstance(project, VB6Project)
+
+    def test_simple_project_metadata(self):
+        """Test that simple project metadata is correctly parsed"""
+        project = self.parsed_simple
+        self.assertEqual(project.name, "SimpleProject")
+        self.assertEqual(project.filename, "simple_project.vbp")
+        self.assertEqual(project.path, str(self.samples_dir))
+
+    def test_simple_project_components(self):
+        """Test that simple project components are correctly parsed"""
+        project = self.parsed_simple
+        self.assertEqual(len(project.components), 3)
+
+        # Verify forms
+        forms = project.components_by_type["Form"]
+        self.assertEqual(len(forms), 1)
+        self.assertEqual(forms[0].name, "frmMain")
+
+        # Verify modules
+        modules = project.components_by_type["Module"]
+        self.assertEqual(len(modules), 1)
+        self.assertEqual(modules[0].name, "modMain")
+
+        # Verify classes
+        classes = project.components_by_type["Class"]
+        self.assertEqual(len(classes), 1)
+        self.assertEqual(classes[0].name, "clsData")
+
+    def test_complex_project_components(self):
+        """Test that complex project components are correctly parsed"""
+        project = self.parsed_complex
+
+        # Verify component counts
+        self.assertGreaterEqual(len(project.components), 10)
+
+        forms_count = len(project.components_by_type["Form"])
+        modules_count = len(project.components_by_type["Module"])
+        classes_count = len(project.components_by_type["Class"])
+
+        self.assertGreaterEqual(forms_count, 5)
+        self.assertGreaterEqual(modules_count, 3)
+        self.assertGreaterEqual(classes_count, 2)
+
+        # Verify specific components exist
+        component_names = [c.name for c in project.components]
+        self.assertIn("frmMain", component_names)
+        self.assertIn("frmOptions", component_names)
+        self.assertIn("modUtility", component_names)
+        self.assertIn("clsDatabase", component_names)
+
+    def test_nonexistent_file(self):
+        """Test that the parser handles nonexistent files gracefully"""
+        nonexistent_file = self.samples_dir / "nonexistent.vbp"
+        project = parse_vbp_file(nonexistent_file)
+        self.assertIsNone(project)
+
+    def test_component_lookup(self):
+        """Test that components can be looked up by name"""
+        project = self.parsed_simple
+        component = project.find_component_by_name("frmMain")
+        self.assertIsNotNone(component)
+        self.assertEqual(component.component_type, "Form")
+
+        # Case insensitive lookup
+        component = project.find_component_by_name("FRMMAIN")
+        self.assertIsNotNone(component)
+        self.assertEqual(component.name, "frmMain")
+
+        # Nonexistent component
+        component = project.find_component_by_name("nonexistent")
+        self.assertIsNone(component)
+
+    def test_parse_cache(self):
+        """Test that an unchanged project file is loaded from the parse cache"""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        with mock.patch.object(vbp_parser, "CACHE_DIR", cache_dir):
+            project = parse_vbp_file(self.complex_project, use_cache=True)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # The second parse must not read the project file again
+            with mock.patch.object(vbp_parser, "read_vbp_file", side_effect=AssertionError):
+                cached = parse_vbp_file(self.complex_project, use_cache=True)
+
+        self.assertEqual(cached.name, project.name)
+        self.assertEqual(cached.path, project.path)
+        self.assertEqual([(c.name, c.filename, c.component_type) for c in cached.components],
+                         [(c.name, c.filename, c.component_type) for c in project.components])
+        self.assertIs(cached.find_component_by_name("frmMain"), cached.components[0])
+
+    def test_invalid_parse_cache_is_ignored(self):
+        """Test that a cache file without the expected layout falls back to parsing"""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        with mock.patch.object(vbp_parser, "CACHE_DIR", cache_dir):
+            with open(vbp_parser.get_cache_file(self.complex_project), 'w', encoding='utf-8') as f:
+                f.write('{"name": "Stale", "components": 42}')
+
+            project = parse_vbp_file(self.complex_project, use_cache=True)
+
+        self.assertNotEqual(project.name, "Stale")
+        self.assertEqual(len(project.components), len(self.parsed_complex.components))
+
+
+if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
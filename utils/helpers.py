@@ -1,13 +1,54 @@
-def count_components_by_type(project, component_type):
-    """Count components by type"""
-    return sum(1 for component in project.components if component.component_type == component_type)
-
-
-def has_dependents(project, component):
-    """Check if a component has any dependents"""
-    return any(component.name in other.dependencies for other in project.components if other != component)
-
-
-def get_dependents(project, component):
-    """Get all components that depend on this component"""
+from collections import defaultdict
+
+
+class ProjectIndex:
+    """Lookup tables built from a single pass over a project's components"""
+
+    def __init__(self, project):
+        self.components_by_type = defaultdict(list)  # Components of each type, in project order
+        self.component_by_name = {}  # Keyed by lowercase name; the first component wins
+        self.dependents_by_name = defaultdict(list)
+        self.targets_by_name = defaultdict(list)  # Resolved, unique dependency targets per source
+        self.edges = []  # Unique (source name, target name) pairs between known components
+
+        for component in project.components:
+            self.components_by_type[component.component_type].append(component)
+            self.component_by_name.setdefault(component.name.lower(), component)
+
+            # Invert the dependency lists so dependents can be looked up directly
+            for dep in component.unique_dependencies:
+                self.dependents_by_name[dep].append(component)
+
+        # Resolve dependencies to components once, dropping duplicates and unknown names
+        edges = {}
+        for component in project.components:
+            for dep in component.unique_dependencies:
+                target = self.component_by_name.get(dep.lower())
+                if target and (component.name, target.name) not in edges:
+                    edges[(component.name, target.name)] = None
+                    self.targets_by_name[component.name].append(target)
+        self.edges = list(edges)
+
+
+def build_project_index(project):
+    """Build the lookup index for a project as it is now
+
+    The index is a snapshot: build it once per report or export and pass it to the code
+    that needs it, rather than keeping it across changes to the project.
+    """
+    return ProjectIndex(project)
+
+
+def count_components_by_type(project, component_type):
+    """Count components by type"""
+    return len(project.components_by_type.get(component_type, ()))
+
+
+def has_dependents(project, component):
+    """Check if a component has any dependents"""
+    return any(component.name in other.dependencies for other in project.components if other != component)
+
+
+def get_dependents(project, component):
+    """Get all components that depend on this component"""
     return [other for other in project.components if component.name in other.dependencies]
\ No newline at end of file
@@ -1,109 +1,247 @@
-"""
-Logging module for VB6 Project Mapper
-Provides consistent logging across all modules with different log levels
-"""
-
-import os
-import sys
-import json
-import uuid
-import logging
-import logging.config
-from datetime import datetime
-
-# Generate a unique run ID
-RUN_ID = datetime.now().strftime("%Y%m%d_%H%M%S") + "_" + str(uuid.uuid4())[:8]
-
-
-def setup_logging(name=None, console_level=None, config_file="logging_config.json"):
-    """
-    Set up logging using configuration file with optional overrides
-
-    Args:
-        name (str, optional): Logger name, typically __name__ from the calling module
-        console_level (int, optional): Override console log level from command line
-        config_file (str, optional): Path to logging configuration file
-
-    Returns:
-        logging.Logger: Configured logger instance
-    """
-    # Create logger instance
-    logger_name = name or "vb6mapper"
-    logger = logging.getLogger(logger_name)
-
-    # Only configure if it hasn't been done already
-    if not logging.getLogger().handlers:
-        # Ensure log directories exist
-        create_log_directories()
-
-        # Load configuration
-        if os.path.exists(config_file):
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-
-            # Update filenames with timestamp
-            for handler in config["handlers"].values():
-                if "filename" in handler:
-                    handler["filename"] = handler["filename"].replace("TIMESTAMP", RUN_ID)
-
-            # Apply configuration
-            logging.config.dictConfig(config)
-
-            # Log initialization
-            root_logger = logging.getLogger()
-            root_logger.info(f"Logging initialized with Run ID: {RUN_ID}")
-        else:
-            # Fallback to basic configuration if config file is missing
-            logging.basicConfig(
-                level=logging.INFO,
-                format="%(levelname)s: %(message)s",
-                stream=sys.stderr
-            )
-            logger.warning(f"Config file {config_file} not found, using basic configuration")
-
-    # Override console handler level if specified (e.g., from command line)
-    if console_level is not None:
-        for handler in logging.getLogger().handlers:
-            if isinstance(handler, logging.StreamHandler) and handler.stream == sys.stderr:
-                handler.setLevel(console_level)
-                logger.debug(f"Console log level overridden to: {console_level}")
-
-    return logger
-
-
-def create_log_directories():
-    """Create the directory structure for log files"""
-    log_dirs = [
-        "logs/debug",
-        "logs/info",
-        "logs/warning",
-        "logs/error",
-        "logs/critical"
-    ]
-
-    for directory in log_dirs:
-        os.makedirs(directory, exist_ok=True)
-
-
-def get_logger(name=None):
-    """
-    Get an existing logger or create a new one
-
-    Args:
-        name (str, optional): Logger name, typically __name__ from the calling module
-
-    Returns:
-        logging.Logger: Logger instance
-    """
-    logger_name = name or "vb6mapper"
-    return logging.getLogger(logger_name)
-
-
-def get_run_id():
-    """
-    Get the unique ID for the current run
-
-    Returns:
-        str: The run ID
-    """
+"""
+Logging module for VB6 Project Mapper
+Provides consistent logging across all modules with different log levels
+"""
+
+import os
+import sys
+import copy
+import time
+import types
+import logging
+from functools import lru_cache
+
+# Generate a unique run ID: local start time plus 8 random hex digits
+RUN_ID = time.strftime("%Y%m%d_%H%M%S") + "_" + os.urandom(4).hex()
+
+# Name of the stderr handler in the logging config file, and that handler once the
+# config has been applied, so console level overrides needn't search for it
+CONSOLE_HANDLER_NAME = "console"
+_console_handler = None
+
+# Set by the first setup_logging call; later calls only apply their overrides, until
+# reset_logging clears it
+_logging_configured = False
+
+
+def setup_logging(name=None, console_level=None, config_file="logging_config.json"):
+    """
+    Set up logging using configuration file with optional overrides
+
+    Logger levels come from the configuration only; to change console verbosity later,
+    use override_console_level rather than Logger.setLevel.
+
+    Args:
+        name (str, optional): Logger name, typically __name__ from the calling module
+        console_level (int, optional): Override console log level from command line
+        config_file (str, optional): Path to logging configuration file
+
+    Returns:
+        logging.Logger: Configured logger instance
+    """
+    global _console_handler, _logging_configured
+
+    # Only needed to apply a config file, so modules that just call get_logger don't pay
+    # for importing it (or json, in load_logging_config)
+    import logging.config as logging_config
+
+    # Create logger instance
+    logger_name = name or "vb6mapper"
+    logger = logging.getLogger(logger_name)
+
+    # Only configure if it hasn't been done already
+    if not _logging_configured:
+        # The project's log formats don't use thread or process details, so records
+        # needn't collect them. Only done here, so that merely importing this module
+        # leaves other programs' logging alone
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+        # Ensure log directories exist
+        create_log_directories()
+
+        # Load configuration; the one stat both checks the file exists and gives the
+        # modification time the parsed config is cached by
+        try:
+            config_mtime = os.stat(config_file).st_mtime_ns
+        except OSError:
+            _console_handler = None
+
+            # Fallback to basic configuration if config file is missing
+            logging.basicConfig(
+                level=logging.INFO,
+                format="%(levelname)s: %(message)s",
+                stream=sys.stderr
+            )
+            logger.warning("Config file %s not found, using basic configuration", config_file)
+        else:
+            # dictConfig consumes the dict it is given, so it gets a copy of the cached one
+            config = copy.deepcopy(load_logging_config(config_file, config_mtime))
+
+            # Apply configuration
+            logging_config.dictConfig(config)
+            _console_handler = _get_root_handler(CONSOLE_HANDLER_NAME)
+
+            # Log initialization; like all logging calls here, arguments are passed
+            # separately so the message is only formatted if a handler emits it (see
+            # "Optimization" in the logging HOWTO)
+            root_logger = logging.getLogger()
+            root_logger.info("Logging initialized with Run ID: %s", RUN_ID)
+
+        _logging_configured = True
+
+    # Override console handler level if specified (e.g., from command line)
+    if console_level is not None:
+        override_console_level(console_level, logger)
+
+    return logger
+
+
+def override_console_level(level, logger=None):
+    """
+    Change the level of console output without touching any logger's level
+
+    Loggers cache their isEnabledFor results, and Logger.setLevel clears those caches
+    for every logger. Levels should therefore only be adjusted on handlers, via this
+    function, once setup_logging has run; nothing in this module calls Logger.setLevel.
+
+    Args:
+        level (int): New level for the console handler
+        logger (logging.Logger, optional): Logger to report the change through, by
+            default the "vb6mapper" logger
+    """
+    if _console_handler is not None:
+        console_handlers = (_console_handler,)
+    else:
+        # Logging wasn't configured from the config file, so look for stderr handlers
+        console_handlers = [handler for handler in logging.getLogger().handlers
+                            if isinstance(handler, logging.StreamHandler) and handler.stream == sys.stderr]
+    for handler in console_handlers:
+        handler.setLevel(level)
+    (logger or get_logger()).debug("Console log level overridden to: %s", level)
+
+
+def reset_logging():
+    """
+    Undo setup_logging, so that its next call applies the configuration file again
+
+    The root logger's handlers are closed and removed. Meant for tests and for hosts that
+    reload the logging configuration; the reapplied configuration comes from the
+    load_logging_config cache if the file is unchanged.
+    """
+    global _console_handler, _logging_configured
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+        handler.close()
+
+    _console_handler = None
+    _logging_configured = False
+
+
+def _get_root_handler(name):
+    """Find a root handler by the name dictConfig gave it, like Python 3.12's getHandlerByName"""
+    for handler in logging.getLogger().handlers:
+        if handler.name == name:
+            return handler
+    return None
+
+
+@lru_cache(maxsize=4)
+def load_logging_config(config_file, mtime_ns):
+    """
+    Read a logging configuration file, with log file names stamped with the run ID
+
+    Results are cached per file and modification time, so setup_logging calls after a
+    reset_logging only parse the file again if it has changed. Callers must not modify
+    the returned dict.
+
+    Args:
+        config_file (str): Path to logging configuration file
+        mtime_ns (int): The file's modification time, as the cache key
+
+    Returns:
+        dict: Configuration for logging.config.dictConfig
+    """
+    import json
+
+    with open(config_file, 'r') as f:
+        raw = f.read()
+
+    # Stamp log file names with the run ID in one pass over the text, before parsing
+    return json.loads(raw.replace("TIMESTAMP", RUN_ID))
+
+
+# Log file directories, one per level, all under LOG_ROOT
+LOG_ROOT = "logs"
+LOG_SUBDIRS = ("debug", "info", "warning", "error", "critical")
+
+# Set once the directories exist, so later calls in the same process touch no files
+_log_dirs_created = False
+
+
+def create_log_directories():
+    """Create the directory structure for log files"""
+    global _log_dirs_created
+    if _log_dirs_created:
+        return
+
+    # Only the shared parent needs makedirs; a plain mkdir per level avoids makedirs
+    # walking and stat'ing the parent again for each one
+    os.makedirs(LOG_ROOT, exist_ok=True)
+    for subdir in LOG_SUBDIRS:
+        try:
+            os.mkdir(os.path.join(LOG_ROOT, subdir))
+        except FileExistsError:
+            pass
+    _log_dirs_created = True
+
+
+# Loggers are singletons per name, so the lookup (and the logging lock it takes) is only
+# needed once per name; tests that reset logging can call get_logger.cache_clear()
+@lru_cache(maxsize=None)
+def get_logger(name=None):
+    """
+    Get an existing logger or create a new one
+
+    Args:
+        name (str, optional): Logger name, typically __name__ from the calling module
+
+    Returns:
+        logging.Logger: Logger instance
+    """
+    return logging.getLogger(name or "vb6mapper")
+
+
+@lru_cache(maxsize=None)
+def get_bound_logger(name=None):
+    """
+    Get a logger's methods already bound, for logging from tight loops
+
+    Calling log.debug(...) on the result skips looking the method up on the Logger
+    instance at every call.
+
+    Args:
+        name (str, optional): Logger name, typically __name__ from the calling module
+
+    Returns:
+        types.SimpleNamespace: debug, info, warning, error, critical and isEnabledFor
+        of the logger, which is itself available as .logger
+    """
+    logger = get_logger(name)
+    return types.SimpleNamespace(debug=logger.debug, info=logger.info,
+                                 warning=logger.warning, error=logger.error,
+                                 critical=logger.critical, isEnabledFor=logger.isEnabledFor,
+                                 logger=logger)
+
+
+def get_run_id():
+    """
+    Get the unique ID for the current run
+
+    Returns:
+        str: The run ID
+    """
     return RUN_ID
\ No newline at end of file